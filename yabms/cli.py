@@ -1,21 +1,21 @@
 """YABMS command-line interface."""
 
 import argparse
+import functools
+import importlib.metadata
 import sys
 
-import pkg_resources
-
-from . import coalesce, permute, protoround
-
 
+@functools.cache
 def get_version():
     """
     Extract the current version number.
 
-    This reaches into `pkg_resources` to find out what was installed.
-    In this way we avoid duplication.
+    This reaches into the installed package metadata to find out what was
+    installed. In this way we avoid duplication. The lookup is cached as
+    it is done every time an argument parser is built.
     """
-    return pkg_resources.require("yabms")[0].version
+    return importlib.metadata.version("yabms")
 
 
 def argument_parser():
@@ -53,6 +53,11 @@ def argument_parser():
         dest="balance",
         help="do not balance the teams",
     )
+    parser.add_argument(
+        "--parallel-solve",
+        action="store_true",
+        help="use Z3's parallel mode when coalescing",
+    )
     parser.add_argument(
         "--proto",
         type=argparse.FileType("r"),
@@ -68,6 +73,11 @@ def argument_parser():
 
 def main(args=sys.argv[1:]):
     """Run as main entry point."""
+    # The scheduling modules pull in z3 and tqdm, which are slow to import.
+    # They are imported here rather than at the top of the module so that
+    # the validator, which only needs get_version, does not pay for them.
+    from . import coalesce, permute, protoround
+
     options = argument_parser().parse_args(args)
 
     if options.rebalance:
@@ -91,6 +101,7 @@ def main(args=sys.argv[1:]):
             pr,
             num_rounds=options.rounds,
             spacing=options.spacing,
+            parallel=options.parallel_solve,
         )
         # print(fs)
     if options.balance:
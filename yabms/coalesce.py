@@ -6,6 +6,8 @@ proto-rounds together to build a single schedule.
 """
 
 import itertools
+import math
+import os
 import sys
 
 import tqdm
@@ -30,8 +32,13 @@ def _total_facings_per_team_pair(match_size, num_matches, num_teams):
     return total_facings // total_matchups
 
 
-def coalesce(proto_round, num_rounds, *, spacing=1):
-    """Coalesce a proto-round sequence into a schedule."""
+def coalesce(proto_round, num_rounds, *, spacing=1, parallel=False):
+    """
+    Coalesce a proto-round sequence into a schedule.
+
+    If `parallel` is set, Z3's parallel (cube-and-conquer) mode is used
+    for the final solve, with one worker thread per available CPU.
+    """
     print("Coalescing proto-rounds...", file=sys.stderr)
 
     if num_rounds == 1:
@@ -40,18 +47,27 @@ def coalesce(proto_round, num_rounds, *, spacing=1):
 
     teams = sorted({y for x in proto_round for y in x})
 
-    min_team = min(teams)
-    max_team = max(teams)
-
     solver = z3.Solver()
 
-    # Mapping of (real team, round number) -> pseudo team number
-    team_to_pseudo_team = {
-        (team_num, round_num): z3.Int(f"team_{team_num}_round_{round_num}")
+    # Mapping of (real team, round number, pseudo team) -> whether the
+    # real team takes the place of that pseudo team in that round. Each
+    # round is a permutation matrix over the teams, which keeps the whole
+    # problem in pure Boolean logic for Z3's SAT core.
+    is_pseudo_team = {
+        (team_num, round_num, pseudo_team): z3.Bool(
+            f"team_{team_num}_round_{round_num}_is_{pseudo_team}"
+        )
         for team_num in teams
         for round_num in range(num_rounds)
+        for pseudo_team in teams
     }
 
+    # Real teams are interchangeable, so any solution can be relabelled
+    # to make the first round the proto-round itself. Pinning that down
+    # saves the solver from exploring all the relabellings.
+    for team_num in teams:
+        solver.add(is_pseudo_team[team_num, 0, team_num])
+
     print("  Adding in-match variables... ", file=sys.stderr, end="")
     in_match = {
         (round_num, team_num, match_num): z3.Bool(
@@ -64,50 +80,62 @@ def coalesce(proto_round, num_rounds, *, spacing=1):
     for round_num in range(num_rounds):
         for team_num in teams:
             for match_num, pseudo_teams in enumerate(proto_round):
-                # Equality
-                solver.add(
-                    z3.Or(
-                        *[
-                            team_to_pseudo_team[team_num, round_num] == pseudo_team
-                            for pseudo_team in pseudo_teams
-                        ],
+                # in_match only ever appears negated (in the spacing and
+                # overlap constraints), so it is enough to force it on
+                # when the team is in the match; the converse direction
+                # would only double the clauses.
+                for pseudo_team in pseudo_teams:
+                    solver.add(
+                        z3.Implies(
+                            is_pseudo_team[team_num, round_num, pseudo_team],
+                            in_match[round_num, team_num, match_num],
+                        )
                     )
-                    == in_match[round_num, team_num, match_num]
-                )
 
     print(f"done, {len(solver.assertions())} constraints", file=sys.stderr)
 
-    # 1: Enforce range constraints
-    print("  Adding range constraints... ", file=sys.stderr, end="")
-    for allocation in team_to_pseudo_team.values():
-        solver.add(allocation >= min_team)
-        solver.add(allocation <= max_team)
-    print(f"done, {len(solver.assertions())} constraints", file=sys.stderr)
-
-    # 2: Enforce round bijection: each allocation is different in each round
+    # 1: Enforce round bijection: in each round, each team takes exactly
+    # one pseudo team and each pseudo team is taken by exactly one team
     print("  Adding round bijection constraints... ", file=sys.stderr, end="")
     for round_num in range(num_rounds):
-        solver.add(
-            z3.Distinct(
-                *[team_to_pseudo_team[team_num, round_num] for team_num in teams]
+        for team_num in teams:
+            solver.add(
+                z3.PbEq(
+                    [
+                        (is_pseudo_team[team_num, round_num, pseudo_team], 1)
+                        for pseudo_team in teams
+                    ],
+                    1,
+                )
+            )
+        for pseudo_team in teams:
+            solver.add(
+                z3.PbEq(
+                    [
+                        (is_pseudo_team[team_num, round_num, pseudo_team], 1)
+                        for team_num in teams
+                    ],
+                    1,
+                )
             )
-        )
     print(f"done, {len(solver.assertions())} constraints", file=sys.stderr)
 
-    # 3: Enforce different allocation in each round
+    # 2: Enforce different allocation in each round
     print("  Adding round disjointness constraints... ", file=sys.stderr, end="")
     for team_num in teams:
-        solver.add(
-            z3.Distinct(
-                *[
-                    team_to_pseudo_team[team_num, round_num]
-                    for round_num in range(num_rounds)
-                ]
+        for pseudo_team in teams:
+            solver.add(
+                z3.PbLe(
+                    [
+                        (is_pseudo_team[team_num, round_num, pseudo_team], 1)
+                        for round_num in range(num_rounds)
+                    ],
+                    1,
+                )
             )
-        )
     print(f"done, {len(solver.assertions())} constraints", file=sys.stderr)
 
-    # 4: Enforce spacing constraints
+    # 3: Enforce spacing constraints
     print("  Adding spacing constraints...", file=sys.stderr)
     for earlier_round_number, early_offset, team_num in tqdm.tqdm(
         itertools.product(
@@ -139,66 +167,84 @@ def coalesce(proto_round, num_rounds, *, spacing=1):
 
     forbid_team_overlap = max(len(proto_round[0]) - 1, 2)
 
-    # 5: Enforce match overlap constraints
+    # 4: Enforce match overlap constraints
     print("  Adding match overlap constraints...", file=sys.stderr)
-    match_pairings = [
-        (
-            earlier_round_num,
-            earlier_match_num,
-            later_round_num,
-            later_match_num,
-        )
+    # These are streamed rather than materialised: the full product of
+    # match pairings and team groups runs to millions of entries for
+    # realistic schedules.
+    earlier_groups = (
+        (earlier_round_num, earlier_match_num, team_group)
         for earlier_round_num in range(num_rounds - 1)
-        for later_round_num in range(earlier_round_num + 1, num_rounds)
         for earlier_match_num in range(len(proto_round))
-        for later_match_num in range(len(proto_round))
-    ]
-    team_groups = list(itertools.combinations(teams, forbid_team_overlap))
-    for (
-        earlier_round_num,
-        earlier_match_num,
-        later_round_num,
-        later_match_num,
-    ), team_group in tqdm.tqdm(
-        itertools.product(match_pairings, team_groups),
-        total=len(match_pairings) * len(team_groups),
+        for team_group in itertools.combinations(teams, forbid_team_overlap)
+    )
+    num_earlier_groups = (
+        (num_rounds - 1) * len(proto_round) * math.comb(len(teams), forbid_team_overlap)
+    )
+    for earlier_round_num, earlier_match_num, team_group in tqdm.tqdm(
+        earlier_groups,
+        total=num_earlier_groups,
     ):
+        # This is shared between every later match the group could meet
+        # again in, so build it once.
         all_in_early_match = z3.And(
             *[
                 in_match[earlier_round_num, team_num, earlier_match_num]
                 for team_num in team_group
             ]
         )
-        all_in_later_match = z3.And(
-            *[
-                in_match[later_round_num, team_num, later_match_num]
-                for team_num in team_group
-            ]
-        )
-        solver.add(
-            z3.Not(
-                z3.And(
-                    all_in_early_match,
-                    all_in_later_match,
+        for later_round_num in range(earlier_round_num + 1, num_rounds):
+            for later_match_num in range(len(proto_round)):
+                all_in_later_match = z3.And(
+                    *[
+                        in_match[later_round_num, team_num, later_match_num]
+                        for team_num in team_group
+                    ]
+                )
+                solver.add(
+                    z3.Not(
+                        z3.And(
+                            all_in_early_match,
+                            all_in_later_match,
+                        )
+                    )
                 )
-            )
-        )
     print(f"     ...done, {len(solver.assertions())} constraints", file=sys.stderr)
 
     # Solve.
     print("Running solver...", file=sys.stderr)
-    result = solver.check()
+    # These are process-wide Z3 settings, so put them back afterwards
+    # rather than leaving every later solver in parallel mode.
+    parallel_params = {
+        "parallel.enable": True,
+        "parallel.threads.max": os.cpu_count() or 1,
+    }
+    previous_params = {name: z3.get_param(name) for name in parallel_params}
+    try:
+        if parallel:
+            for name, value in parallel_params.items():
+                z3.set_param(name, value)
+        result = solver.check()
+    finally:
+        for name, value in previous_params.items():
+            z3.set_param(name, value)
     if result != z3.sat:
         raise ValueError("Unable to solve")
 
     model = solver.model()
 
+    # Read the model out in one pass over its declarations, rather than
+    # evaluating every entry of every permutation matrix separately.
+    true_variables = {decl.name() for decl in model.decls() if z3.is_true(model[decl])}
+
     final_schedule = []
 
     for round_num in range(num_rounds):
         pseudo_team_to_team = {
-            model.evaluate(team_to_pseudo_team[team_num, round_num]).as_long(): team_num
+            pseudo_team: team_num
             for team_num in teams
+            for pseudo_team in teams
+            if f"team_{team_num}_round_{round_num}_is_{pseudo_team}" in true_variables
         }
         for match in proto_round:
             assigned_match = [
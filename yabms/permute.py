@@ -3,6 +3,7 @@
 import collections
 import itertools
 import math
+import operator
 import random
 import sys
 
@@ -12,17 +13,27 @@ import tqdm
 def _entropy(counter):
     """Compute the entropy of a counter."""
     total_count = sum(counter.values())
-    return -sum((x / total_count) * math.log(x / total_count) for x in counter.values())
+    return -sum(
+        (x / total_count) * math.log(x / total_count) for x in counter.values() if x
+    )
 
 
-def _badness(schedule):
-    """Compute how bad the zone collisions in the schedule are."""
-    appearance_counts = collections.Counter(
+def _appearance_counts(schedule):
+    """Count the appearances of each team in each zone."""
+    return collections.Counter(
         (team, zone_number)
         for match in schedule
         for zone_number, team in enumerate(match)
     )
 
+
+def _badness(appearance_counts):
+    """
+    Compute how bad the zone collisions in a schedule are.
+
+    This works from the schedule's team/zone appearance counts, so that
+    callers maintaining those counts do not have to rescan the schedule.
+    """
     best_possible_entropy = math.log(sum(appearance_counts.values()))
 
     # We want to maximise the entropy of the distribution.
@@ -42,6 +53,52 @@ def _badness(schedule):
     return best_possible_entropy - entropy
 
 
+def _plogp_table(total_count):
+    """
+    Tabulate p log(p) for every possible team/zone bin count.
+
+    Counts are small integers bounded by the total number of appearances,
+    so a lookup table saves a logarithm for every scored bin.
+    """
+    return [0.0] + [
+        (count / total_count) * math.log(count / total_count)
+        for count in range(1, total_count + 1)
+    ]
+
+
+def _move_costs(appearance_counts, plogp, match):
+    """
+    Tabulate the change in badness from moving each team to each zone.
+
+    The badness is log(N) + Σ p log(p) over the team/zone bins. The teams
+    in a match are distinct, so their moves touch disjoint bins and the
+    change from permuting the whole match is just the sum of the moves.
+
+    Returns a mapping of team -> list of costs, indexed by new zone.
+    """
+    costs = {}
+    for old_zone, team in enumerate(match):
+        old_count = appearance_counts[team, old_zone]
+        leave_cost = plogp[old_count - 1] - plogp[old_count]
+        team_costs = []
+        for new_zone in range(len(match)):
+            if new_zone == old_zone:
+                team_costs.append(0.0)
+            else:
+                new_count = appearance_counts[team, new_zone]
+                team_costs.append(leave_cost + plogp[new_count + 1] - plogp[new_count])
+        costs[team] = team_costs
+    return costs
+
+
+def _replace_match(appearance_counts, old_match, new_match):
+    """Update team/zone appearance counts for a replaced match."""
+    for zone_number, team in enumerate(old_match):
+        appearance_counts[team, zone_number] -= 1
+    for zone_number, team in enumerate(new_match):
+        appearance_counts[team, zone_number] += 1
+
+
 def permute_zones(schedule):
     """Permute the zones in a schedule for balance."""
     # Do a hard copy
@@ -50,36 +107,78 @@ def permute_zones(schedule):
     print("Balancing zones...", file=sys.stderr)
 
     num_iterations = 1_000
+    # Give up once this many iterations in a row fail to improve on the
+    # best schedule seen so far. Early on, annealing shuffles most of the
+    # schedule and it can take a long while to climb back past the best,
+    # so iterations only count towards this once the annealing temperature
+    # has cooled below `stagnation_temperature`.
+    max_stagnant_iterations = 20
+    stagnation_temperature = 0.25
+
+    # Kept up to date as matches are permuted, so that candidate
+    # permutations can be scored without rescanning the whole schedule.
+    appearance_counts = _appearance_counts(schedule)
+    plogp = _plogp_table(sum(appearance_counts.values()))
+
+    best_score = math.inf
+    best_schedule = schedule
+    stagnant_iterations = 0
 
     for n in tqdm.trange(num_iterations):
         made_changes = False
+        temperature = (1 - n / num_iterations) ** 2
 
-        score = _badness(schedule)
+        score = _badness(appearance_counts)
         # print(f"Iteration {n}: {score}", file=sys.stderr)
 
-        if score < 1e-6:
+        # Annealing can make things worse, so keep hold of the best
+        # schedule rather than returning wherever we stop.
+        if score < best_score - 1e-9:
+            best_score = score
+            best_schedule = [list(x) for x in schedule]
+            stagnant_iterations = 0
+        elif temperature < stagnation_temperature:
+            stagnant_iterations += 1
+
+        if score < 1e-6 or stagnant_iterations > max_stagnant_iterations:
             break
 
         for ix, match in enumerate(schedule):
-            best_permutation = min(
-                itertools.permutations(match),
-                key=lambda perm: _badness(
-                    itertools.chain(schedule[:ix], (perm,), schedule[ix + 1 :])
+            # Finding the best permutation is an assignment problem over
+            # the move costs. Matches only have a handful of zones, so
+            # trying every assignment is cheap once the costs are known.
+            costs = _move_costs(appearance_counts, plogp, match)
+            best_delta, best_permutation = min(
+                (
+                    (
+                        sum(costs[team][zone] for zone, team in enumerate(perm)),
+                        perm,
+                    )
+                    for perm in itertools.permutations(match)
                 ),
+                key=operator.itemgetter(0),
             )
-            if match != list(best_permutation):
+            # The identity permutation scores exactly 0, so require a
+            # real improvement rather than chasing rounding noise.
+            if best_delta < -1e-12:
                 # print(
                 #     f"Altered match {ix} from {match} to {best_permutation}",
                 #     file=sys.stderr,
                 # )
                 made_changes = True
+                _replace_match(appearance_counts, match, best_permutation)
                 schedule[ix] = list(best_permutation)
 
         if not made_changes:
             # Do an annealing step.
-            temperature = (1 - n / num_iterations) ** 2
             for match in schedule:
                 if random.random() < temperature:
+                    old_match = list(match)
                     random.shuffle(match)
+                    _replace_match(appearance_counts, old_match, match)
+
+    # If every iteration ran, the final pass above has not been scored yet.
+    if _badness(appearance_counts) < best_score - 1e-9:
+        best_schedule = schedule
 
-    return schedule
+    return best_schedule
@@ -8,10 +8,12 @@ to populate the proto-rounds with assignments of actual teams, and
 permute the zones.
 """
 
+import functools
 import os
 import os.path
 import pickle
 import sys
+import tempfile
 
 import z3
 
@@ -50,8 +52,16 @@ def _get_cache(key):
 
 def _set_cache(key, value):
     cache_file = _get_cache_file(key)
-    with open(cache_file, "wb") as f:
-        pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+    # Write to a temporary file and move it into place, so that a
+    # concurrent reader never sees a half-written cache entry.
+    fd, temp_file = tempfile.mkstemp(dir=os.path.dirname(cache_file), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_file, cache_file)
+    except BaseException:
+        os.unlink(temp_file)
+        raise
 
 
 def build_proto_round(
@@ -62,8 +72,17 @@ def build_proto_round(
     spacing: int,
 ):
     """Construct a single proto-round."""
+    proto_round = _cached_build_proto_round(
+        num_teams, appearances_per_round, num_zones, spacing
+    )
+    # The cached value is shared between calls, so hand out a copy.
+    return [list(match) for match in proto_round]
+
+
+@functools.lru_cache(maxsize=128)
+def _cached_build_proto_round(num_teams, appearances_per_round, num_zones, spacing):
     # Since this step takes a Bloody Age™, we pull this from a
-    # cache if at all possible.
+    # cache if at all possible: first in memory, then on disk.
     cache_key = f"pround-{num_teams}-{appearances_per_round}-{num_zones}-{spacing}"
     if proto_round := _get_cache(cache_key):
         print("Using cached proto-round", file=sys.stderr)
@@ -88,41 +107,70 @@ def _build_proto_round(
     print(f"Solver for {num_matches} matches", file=sys.stderr)
 
     print("Building constraints...", file=sys.stderr)
-    # Variables for all the match assignments.
-    match_assignments = {
-        (match_number, zone_number): z3.Int(f"match-{match_number}-{zone_number}")
+    # Variables for all the match assignments. These are unsigned
+    # bit-vectors just wide enough to hold `num_teams`, which lets Z3
+    # bit-blast the whole problem to SAT rather than using arithmetic.
+    team_width = num_teams.bit_length()
+
+    # These (and the atoms below) are nested lists indexed by match, then
+    # zone, then team: the constraint loops look them up a great many
+    # times, and list indexing avoids hashing a tuple for each lookup.
+    match_assignments = [
+        [
+            z3.BitVec(f"match-{match_number}-{zone_number}", team_width)
+            for zone_number in range(num_zones)
+        ]
+        for match_number in range(num_matches)
+    ]
+
+    # The "this slot holds this team" atoms are shared by the count,
+    # spacing and facing constraints, so build each one only once.
+    holds_team = [
+        [
+            [assignment == team_number for team_number in range(num_teams)]
+            for assignment in match_assignments[match_number]
+        ]
         for match_number in range(num_matches)
-        for zone_number in range(num_zones)
-    }
+    ]
 
-    def num_appearances_in_window(team, window_start=0, window_end=-1):
-        """Count the number of appearances of a team in a window."""
+    def appearances_in_window(team, window_start=0, window_end=-1):
+        """
+        List the possible appearances of a team in a window.
+
+        These are given as weighted terms ready for Z3's pseudo-Boolean
+        constraints (PbEq, PbLe), which are handled natively as
+        cardinality constraints rather than as arithmetic sums.
+        """
         if window_end < 0:
             window_end = num_matches
-        return sum(
-            z3.If(match_assignments[match, zone] == team, 1, 0)
+        return [
+            (holds_team[match][zone][team], 1)
             for match in range(window_start, window_end)
             for zone in range(num_zones)
-        )
+        ]
 
-    # 1: Range constraints. Each assignment must be a team number.
-    for appearance in match_assignments.values():
-        solver.add(appearance >= 0)
-        solver.add(appearance < num_teams)
+    # 1: Range constraints. Each assignment must be a team number. The
+    # order constraints below make each match strictly increasing, so it
+    # is enough to bound the last zone of each match (the bit-vectors are
+    # unsigned, so there is no lower bound to enforce).
+    for match_number in range(num_matches):
+        solver.add(z3.ULT(match_assignments[match_number][-1], num_teams))
 
     # 2: Order constraints. Each match has teams in strictly increasing
     # order. This necessarily implies uniqueness within a match.
     for match_number in range(num_matches):
         for zone_number in range(num_zones - 1):
             solver.add(
-                match_assignments[match_number, zone_number]
-                < match_assignments[match_number, zone_number + 1]
+                z3.ULT(
+                    match_assignments[match_number][zone_number],
+                    match_assignments[match_number][zone_number + 1],
+                )
             )
 
     # 3: Count constraints. Each team must appear exactly the right
     # number of times in the schedule.
     for team_number in range(num_teams):
-        solver.add(num_appearances_in_window(team_number) == appearances_per_round)
+        solver.add(z3.PbEq(appearances_in_window(team_number), appearances_per_round))
 
     # 4: Spacing constraints. Teams must have at least the spacing gap
     # between appearances. We implement this as a sliding (spacing + 1)
@@ -132,32 +180,32 @@ def _build_proto_round(
             window_end = window_start + spacing + 1
             for team_number in range(num_teams):
                 solver.add(
-                    num_appearances_in_window(team_number, window_start, window_end)
-                    <= 1
+                    z3.PbLe(
+                        appearances_in_window(team_number, window_start, window_end),
+                        1,
+                    )
                 )
 
     # 5: Facing constraints. Each team may face any given other team in this
     # proto-round at most once. This is not relevant if there is only one
     # appearance per team.
     if appearances_per_round > 1:
+        # This loop builds O(teams² · zones² · matches) terms, so bind the
+        # hot lookups to locals.
+        z3_and = z3.And
         for left_team in range(num_teams - 1):
             for right_team in range(left_team + 1, num_teams):
-                times_faced = 0
-                for left_zone in range(num_zones - 1):
-                    for right_zone in range(left_zone + 1, num_zones):
-                        for match_number in range(num_matches):
-                            is_facing = z3.And(
-                                (
-                                    match_assignments[match_number, left_zone]
-                                    == left_team
-                                ),
-                                (
-                                    match_assignments[match_number, right_zone]
-                                    == right_team
-                                ),
+                facings = []
+                for match_holds_team in holds_team:
+                    for left_zone in range(num_zones - 1):
+                        holds_left_team = match_holds_team[left_zone][left_team]
+                        for right_zone in range(left_zone + 1, num_zones):
+                            is_facing = z3_and(
+                                holds_left_team,
+                                match_holds_team[right_zone][right_team],
                             )
-                            times_faced += z3.If(is_facing, 1, 0)
-                solver.add(times_faced <= 1)
+                            facings.append((is_facing, 1))
+                solver.add(z3.PbLe(facings, 1))
 
     print("Solving...", file=sys.stderr)
     result = solver.check()
@@ -167,13 +215,15 @@ def _build_proto_round(
 
     model = solver.model()
 
+    # Read the model out in one pass over its declarations, rather than
+    # evaluating each assignment separately.
+    values = {decl.name(): model[decl] for decl in model.decls()}
+
     matches = []
     for match_number in range(num_matches):
         match = []
         for zone_number in range(num_zones):
-            match.append(
-                model.eval(match_assignments[(match_number, zone_number)]).as_long()
-            )
+            match.append(values[f"match-{match_number}-{zone_number}"].as_long())
         matches.append(match)
 
     return matches
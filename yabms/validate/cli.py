@@ -4,7 +4,7 @@ import argparse
 import sys
 
 from ..cli import get_version
-from . import validator_registry, validators
+from . import validators
 
 
 def argument_parser():
@@ -35,26 +35,33 @@ def main(args=sys.argv[1:]):
     """Run as main entry point."""
     options = argument_parser().parse_args(args)
 
-    matches = []
-
+    # Read the whole input at once and split it, rather than iterating the
+    # file line by line. Blank lines do not describe a match, so skip them.
     with options.input as f:
-        for line in f:
-            matches.append(line.strip().split(options.separator))
+        lines = f.read().splitlines()
 
-    validator_registry.register_all_validators()
+    matches = [line.split(options.separator) for line in map(str.strip, lines) if line]
 
-    warnings, errors = validators.run_validators(matches)
+    # Intern team names to small consecutive integer IDs once, so that the
+    # validators work on integers rather than hashing and comparing the
+    # names over and over. IDs are given in sorted order of name, so that
+    # ordering by ID is the same as ordering by name.
+    team_names = sorted({team for match in matches for team in match})
+    team_ids = {team: ix for ix, team in enumerate(team_names)}
+    schedule = [[team_ids[team] for team in match] for match in matches]
 
-    for code, warning in warnings:
-        print(f"W {code}: {warning}")
-    for code, error in errors:
-        print(f"E {code}: {error}")
+    warnings, errors = validators.run_validators(schedule, team_names)
 
-    print(f"{len(warnings)} warnings, {len(errors)} errors")
+    # Build the report up and write it out in one call, rather than paying
+    # for a print() per message on schedules with many problems.
+    report = [f"W {code}: {warning}\n" for code, warning in warnings]
+    report.extend(f"E {code}: {error}\n" for code, error in errors)
+    report.append(f"{len(warnings)} warnings, {len(errors)} errors\n")
 
     if errors:
-        print("Validation failed.")
-        sys.exit(1)
+        report.append("Validation failed.\n")
     else:
-        print("Validation succeeded.")
-        sys.exit(0)
+        report.append("Validation succeeded.\n")
+
+    sys.stdout.write("".join(report))
+    sys.exit(1 if errors else 0)
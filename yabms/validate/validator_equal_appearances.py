@@ -1,14 +1,17 @@
 """Validator: teams all appear the same number of times."""
 
+import itertools
 from collections import Counter
 
 from .validators import error, validator
 
 
 @validator("equal_appearances")
-def validate_equal_appearances(schedule):
+def validate_equal_appearances(schedule, team_names):
     """Validate that all teams appear the same number of times."""
-    num_appearances = Counter(team for match in schedule for team in match)
+    # Counting straight off the chained iterator keeps the tally in
+    # Counter's C loop rather than a generator expression.
+    num_appearances = Counter(itertools.chain.from_iterable(schedule))
 
     most_appearances = max(num_appearances.values())
 
@@ -16,5 +19,5 @@ def validate_equal_appearances(schedule):
         if num_appearances[team] != most_appearances:
             yield error(
                 "unequal-appearances",
-                f"Team {team} appears {num_appearances[team]} times, expected {most_appearances}",
+                f"Team {team_names[team]} appears {num_appearances[team]} times, expected {most_appearances}",
             )
@@ -10,39 +10,60 @@ FACING_ERROR_THRESHOLD = 4
 
 
 @validator("facing", after=[validate_equal_appearances])
-def validate_facing(schedule):
+def validate_facing(schedule, team_names):
     """Validate that teams face a balanced mixture of other teams."""
-    all_teams = sorted({team for match in schedule for team in match})
+    num_teams = len(team_names)
 
-    facings = {
-        (left_team, right_team): 0
-        for ix, left_team in enumerate(all_teams[:-1])
-        for right_team in all_teams[ix + 1 :]
-    }
+    # Pair counts live in one flat list indexed by left * num_teams + right,
+    # with left < right, rather than a dict keyed by tuples.
+    facings = [0] * (num_teams * num_teams)
 
     for match in schedule:
         for left_team, right_team in itertools.combinations(sorted(match), 2):
-            facings[left_team, right_team] += 1
+            facings[left_team * num_teams + right_team] += 1
 
-    most_facings = max(facings.values())
+    # The upper triangle of the counts, as one slice per left-hand team:
+    # facings_by_left[left_team][offset] counts left_team against
+    # left_team + 1 + offset.
+    facings_by_left = [
+        facings[left_team * num_teams + left_team + 1 : (left_team + 1) * num_teams]
+        for left_team in range(num_teams - 1)
+    ]
 
-    example_most_facings_pair_a, example_most_facings_pair_b = next(
-        facing for facing, count in facings.items() if count == most_facings
+    most_facings = max(map(max, facings_by_left))
+
+    example_most_facings_pair_a = next(
+        left_team
+        for left_team, row in enumerate(facings_by_left)
+        if most_facings in row
+    )
+    example_most_facings_pair_b = (
+        example_most_facings_pair_a
+        + 1
+        + facings_by_left[example_most_facings_pair_a].index(most_facings)
     )
 
-    for (left_team, right_team), facings_between in facings.items():
-        facing_unbalance = most_facings - facings_between
-
-        if facing_unbalance < FACING_WARNING_THRESHOLD:
-            continue
-
-        if facing_unbalance < FACING_ERROR_THRESHOLD:
-            yield warning(
-                "unequal-facings",
-                f"Team {left_team} and {right_team} face each other {facings_between} times, ideally {most_facings} (cf {example_most_facings_pair_a} and {example_most_facings_pair_b})",
-            )
-        else:
-            yield error(
-                "unequal-facings",
-                f"Team {left_team} and {right_team} face only {facings_between} times, ideally {most_facings} (cf {example_most_facings_pair_a} and {example_most_facings_pair_b})",
-            )
+    # Only pairs which fall at least FACING_WARNING_THRESHOLD short of the
+    # most are reported, and there are usually few of them, so pick them
+    # out of each row with compress rather than testing every pair here.
+    reportable_facings = most_facings - FACING_WARNING_THRESHOLD
+
+    for left_team, row in enumerate(facings_by_left):
+        reported_offsets = itertools.compress(
+            itertools.count(), map(reportable_facings.__ge__, row)
+        )
+        for offset in reported_offsets:
+            right_team = left_team + 1 + offset
+            facings_between = row[offset]
+            facing_unbalance = most_facings - facings_between
+
+            if facing_unbalance < FACING_ERROR_THRESHOLD:
+                yield warning(
+                    "unequal-facings",
+                    f"Team {team_names[left_team]} and {team_names[right_team]} face each other {facings_between} times, ideally {most_facings} (cf {team_names[example_most_facings_pair_a]} and {team_names[example_most_facings_pair_b]})",
+                )
+            else:
+                yield error(
+                    "unequal-facings",
+                    f"Team {team_names[left_team]} and {team_names[right_team]} face only {facings_between} times, ideally {most_facings} (cf {team_names[example_most_facings_pair_a]} and {team_names[example_most_facings_pair_b]})",
+                )
@@ -0,0 +1,50 @@
+"""Validator: matches are the right size, without duplicates or reruns."""
+
+import itertools
+
+from .validators import error, validator
+
+
+@validator("matches")
+def validate_matches(schedule, team_names):
+    """
+    Validate the shape of each match.
+
+    Checks that all matches have the same number of teams, that no match
+    has the same team twice, and that no two matches have the same teams.
+    These all look at one match at a time, so they share a single pass
+    over the schedule and a single sort of each match.
+    """
+    num_teams = len(schedule[0])
+    combinations = {}
+
+    for ix, match in enumerate(schedule):
+        if len(match) != num_teams:
+            yield error(
+                "wrong-size", f"Match {ix} has {len(match)} teams, expected {num_teams}"
+            )
+
+        teams_this_match = tuple(sorted(match))
+
+        # Fast path: almost every match is free of duplicates, which a set
+        # shows more cheaply than walking the sorted teams.
+        if len(set(teams_this_match)) != len(teams_this_match):
+            for team, appearances in itertools.groupby(teams_this_match):
+                count = sum(1 for _ in appearances)
+                if count > 1:
+                    yield error(
+                        "dupe",
+                        f"Team {team_names[team]} appears in match {ix} {count} times",
+                    )
+
+        if teams_this_match in combinations:
+            previous_ix = combinations[teams_this_match]
+            teams_this_match_str = ", ".join(
+                team_names[team] for team in teams_this_match
+            )
+            yield error(
+                "rerun",
+                f"Match {ix} has the same teams as match {previous_ix} ({teams_this_match_str})",
+            )
+        else:
+            combinations[teams_this_match] = ix
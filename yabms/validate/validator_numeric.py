@@ -4,21 +4,22 @@ from .validators import validator, warning
 
 
 @validator("numeric")
-def validate_numeric(schedule):
+def validate_numeric(schedule, team_names):
     """Validate that teams names are consecutive numbers."""
-    all_teams = sorted({team for match in schedule for team in match})
-
     numeric_teams = []
 
-    for team in all_teams:
+    for team_name in team_names:
         try:
-            numeric_teams.append(int(team))
+            numeric_teams.append(int(team_name))
         except ValueError:
             yield warning(
                 "non-numeric",
-                f"Team {team!r} is not a number",
+                f"Team {team_name!r} is not a number",
             )
 
+    if not numeric_teams:
+        return
+
     lowest_team = min(numeric_teams)
     highest_team = max(numeric_teams)
 
@@ -28,8 +29,8 @@ def validate_numeric(schedule):
             f"Team numbers are not one-indexed, lowest is {lowest_team}",
         )
     else:
-        if highest_team != len(all_teams):
+        if highest_team != len(team_names):
             yield warning(
                 "non-consecutive",
-                f"Team numbers are not consecutive, highest is {highest_team} but should be {len(all_teams)}",
+                f"Team numbers are not consecutive, highest is {highest_team} but should be {len(team_names)}",
             )
@@ -1,15 +1,19 @@
-"""Make sure all validators are registered."""
+"""The full set of validators, in the order they run."""
 
+from .validator_equal_appearances import validate_equal_appearances
+from .validator_facing import validate_facing
+from .validator_matches import validate_matches
+from .validator_numeric import validate_numeric
+from .validator_spacing import validate_spacing
+from .validator_zone_distribution import validate_zone_distribution
 
-def register_all_validators():
-    """Make sure all validators are registered."""
-    from . import (  # noqa: F401
-        validator_dupes,
-        validator_equal_appearances,
-        validator_facing,
-        validator_numeric,
-        validator_rerun,
-        validator_size,
-        validator_spacing,
-        validator_zone_distribution,
-    )
+# Each validator must come after any validators named in its `after`.
+# validate_matches goes first so that malformed matches head the report.
+VALIDATORS = (
+    validate_matches,
+    validate_equal_appearances,
+    validate_facing,
+    validate_numeric,
+    validate_spacing,
+    validate_zone_distribution,
+)
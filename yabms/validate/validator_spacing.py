@@ -8,15 +8,19 @@ MIN_SPACING = 1
 
 
 @validator("spacing", after=[validate_equal_appearances])
-def validate_spacing(schedule):
+def validate_spacing(schedule, team_names):
     """Validate that teams have sufficient gap between matches."""
-    window_size = MIN_SPACING + 1
+    # Walk the schedule once, remembering the last match each team was in,
+    # rather than searching the following matches for every team.
+    last_seen = [None] * len(team_names)
 
-    for ix, match in enumerate(schedule[: -window_size + 1]):
+    for ix, match in enumerate(schedule):
         for team in match:
-            for other_match in schedule[ix + 1 : ix + window_size]:
-                if team in other_match:
-                    yield error(
-                        "spacing",
-                        f"Team {team} appears in match {ix} and {ix + window_size}",
-                    )
+            previous_ix = last_seen[team]
+            # A team listed twice in one match is left to validate_matches.
+            if previous_ix is not None and 0 < ix - previous_ix <= MIN_SPACING:
+                yield error(
+                    "spacing",
+                    f"Team {team_names[team]} appears in match {previous_ix} and {ix}",
+                )
+            last_seen[team] = ix
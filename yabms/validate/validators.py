@@ -1,9 +1,10 @@
 """Schedule validators."""
 
-_VALIDATORS = []
-
 # A validator is a generator which yields warnings and errors.
-# The generator can return False to stop the validation process.
+#
+# Validators are called with the schedule, as a list of matches each of
+# which is a list of integer team IDs, and the list of team names which
+# those IDs index into.
 
 
 def validator(name, *, after=None):
@@ -12,11 +13,12 @@ def validator(name, *, after=None):
 
     To specify an order for validators, use the `after` keyword argument
     with a list of other validators (NB validators, not names) that must
-    have already run.
+    have already run. The order itself is fixed by `VALIDATORS` in
+    `validator_registry`, which must list those validators first.
     """
     # For the `after` keyword, we actually just check they're not names:
     # the fact that the concrete objects have already had validator()
-    # called means they are already earlier in the sequence.
+    # called means they are already defined, and can be listed earlier.
     if after is not None:
         for other in after:
             if isinstance(other, str):
@@ -26,7 +28,6 @@ def validator(name, *, after=None):
 
     def decorator(func):
         func._validator_name = name
-        _VALIDATORS.append(func)
         return func
 
     return decorator
@@ -52,30 +53,29 @@ def warning(code, message):
     return "warning", code, message
 
 
-def _run_validator(validator, schedule, warnings, errors):
+def _run_validator(validator, schedule, team_names, warnings, errors):
     """Run a single validator."""
-    generator = validator(schedule)
-    try:
-        while True:
-            level, code, message = next(generator)
-            if level == "error":
-                errors.append((code, message))
-            elif level == "warning":
-                warnings.append((code, message))
-            else:
-                raise ValueError(f"Unknown level {level!r}")
-    except StopIteration as e:
-        if e.value is False:
-            return False
-    return True
-
-
-def run_validators(schedule):
+    for level, code, message in validator(schedule, team_names):
+        if level == "error":
+            errors.append((code, message))
+        elif level == "warning":
+            warnings.append((code, message))
+        else:
+            raise ValueError(f"Unknown level {level!r}")
+
+
+def run_validators(schedule, team_names):
     """
     Run all validators on a schedule.
 
+    The schedule is a list of matches, each a list of integer team IDs
+    indexing into `team_names`.
+
     Returns a tuple of (warnings, errors).
     """
+    # Imported here as the validator modules themselves import this one.
+    from .validator_registry import VALIDATORS
+
     warnings = []
     errors = []
 
@@ -83,7 +83,6 @@ def run_validators(schedule):
     if not schedule:
         return [], ["No matches in schedule"]
 
-    for validator in _VALIDATORS:
-        if not _run_validator(validator, schedule, warnings, errors):
-            break
+    for validator in VALIDATORS:
+        _run_validator(validator, schedule, team_names, warnings, errors)
     return warnings, errors